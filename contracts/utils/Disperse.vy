@@ -0,0 +1,33 @@
+# @version ^0.3.9
+"""
+@title Disperse
+@custom:contract-name Disperse
+@license MIT
+@author z80
+@notice Test utility for funding many accounts with many tokens in a
+        single transaction.
+"""
+
+from vyper.interfaces import ERC20
+
+MAX_TOKENS: constant(uint256) = 16
+MAX_RECIPIENTS: constant(uint256) = 16
+
+@external
+def disperse(
+    tokens: DynArray[ERC20, MAX_TOKENS],
+    recipients: DynArray[address, MAX_RECIPIENTS],
+    amount: uint256
+):
+    """
+    @dev Transfers `amount` of every token from the caller to every
+         recipient.
+    @notice The caller must have approved this contract for at least
+            `amount * len(recipients)` of each token.
+    @param tokens The ERC20 tokens to be dispersed.
+    @param recipients The addresses receiving the tokens.
+    @param amount The amount of each token sent to each recipient.
+    """
+    for token in tokens:
+        for recipient in recipients:
+            assert token.transferFrom(msg.sender, recipient, amount, default_return_value=True), "Failed to transfer token"
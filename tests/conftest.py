@@ -1,48 +1,117 @@
 import pytest
+from eth_abi.packed import encode_packed
+
+# token amounts in wei, so ape doesn't parse unit strings on every call
+SUPPLY = 100_000_000 * 10**18
+GRANT = 100 * 10**18
+MAX_UINT256 = 2**256 - 1
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--force-recompile",
+        action="store_true",
+        default=False,
+        help="Recompile all contracts instead of reusing the artifacts in .build/",
+    )
+
+# ape already recompiles only the sources that changed; this just bypasses its cache
+def pytest_sessionstart(session):
+    if not session.config.getoption("--force-recompile"):
+        return
+    # imported here: every fixture below takes ape's own `project` fixture
+    from ape import project
+    project.load_contracts(use_cache=False)
+
+# revert every test back to the chain state left by the session fixtures
+@pytest.fixture(autouse=True)
+def _snap(chain):
+    snap = chain.snapshot()
+    yield
+    chain.restore(snap)
 
 # define fixture for tokens
-@pytest.fixture
-def tokens(project, deployer, accounts):
-    tokens = []
-
-    # iterate from A to J and deploy a token for each
-    for i in range(5):
-        tokens.append(project.Token.deploy("100000000 ether", chr(65 + i), chr(65 + i), sender=deployer))
-    for recipient in accounts[1:5]:
-        for token in tokens:
-            token.transfer(recipient, "100 ether", sender=deployer)
+@pytest.fixture(scope="session")
+def tokens(project, deployer, traders):
+    # deploy tokens A to E
+    tokens = [project.Token.deploy(SUPPLY, chr(65 + i), chr(65 + i), sender=deployer) for i in range(5)]
+
+    # fund every trader with every token in a single transaction
+    disperse = project.Disperse.deploy(sender=deployer)
+    for token in tokens:
+        token.approve(disperse, GRANT * len(traders), sender=deployer)
+    disperse.disperse(tokens, traders, GRANT, sender=deployer)
     return tokens
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def deployer(accounts):
     return accounts[0]
 
-@pytest.fixture
+# the provider's prefunded accounts; tests run serially, so none need funding per worker
+@pytest.fixture(scope="session")
 def maker(accounts):
     return accounts[1]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def taker(accounts):
     return accounts[2]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def turtle(accounts):
     return accounts[3]
 
-@pytest.fixture
-def books(project, deployer):
+@pytest.fixture(scope="session")
+def traders(maker, taker, turtle):
+    return [maker, taker, turtle]
+
+@pytest.fixture(scope="session")
+def books(project, deployer, tokens, maker, taker, turtle):
+    tokenA, tokenB = tokens[:2]
     bookA = project.Book.deploy(1, sender=deployer)
     bookB = project.Book.deploy(2, sender=deployer)
     bookA.add_trusted_book(bookB, sender=deployer)
     bookB.add_trusted_book(bookA, sender=deployer)
+    # orders sell tokenA on bookA and are filled with tokenB through bookB
+    tokenA.approve(bookA, MAX_UINT256, sender=maker)
+    for filler in [taker, turtle]:
+        tokenB.approve(bookB, MAX_UINT256, sender=filler)
     return [bookA, bookB]
 
 # define fixture for book contract
-@pytest.fixture
-def book(project, deployer):
-    return project.Book.deploy(0, sender=deployer)
+@pytest.fixture(scope="session")
+def book(project, deployer, tokens, maker, taker):
+    tokenA, tokenB = tokens[:2]
+    book = project.Book.deploy(0, sender=deployer)
+    # the maker sells tokenA and the taker pays in tokenB
+    tokenA.approve(book, MAX_UINT256, sender=maker)
+    tokenB.approve(book, MAX_UINT256, sender=taker)
+    return book
 
-@pytest.fixture
-def lz_mock(accounts, project):
-    lz_mock = project.EndpointMock.deploy(101, sender=accounts[0])
+@pytest.fixture(scope="session")
+def lz_mock(deployer, project):
+    lz_mock = project.EndpointMock.deploy(101, sender=deployer)
     return lz_mock
+
+# route both apps through the mock endpoint and trust each other as remotes
+# setTrustedRemote is owner-only, so it has to be sent by the owner
+def connect_lzapps(lz_mock, lzapp, lzapp2, owner):
+    lz_mock.setDestLzEndpoint(lzapp.address, lz_mock.address, sender=owner)
+    lz_mock.setDestLzEndpoint(lzapp2.address, lz_mock.address, sender=owner)
+    # a trusted remote path is the remote address followed by the local address
+    path = encode_packed(['address', 'address'], [lzapp2.address, lzapp.address])
+    path2 = encode_packed(['address', 'address'], [lzapp.address, lzapp2.address])
+    lzapp.setTrustedRemote(101, path, sender=owner)
+    lzapp2.setTrustedRemote(101, path2, sender=owner)
+
+@pytest.fixture(scope="session")
+def omnicounters(project, deployer, lz_mock):
+    lzapp = project.OmniCounter.deploy(lz_mock, sender=deployer)
+    lzapp2 = project.OmniCounter.deploy(lz_mock, sender=deployer)
+    connect_lzapps(lz_mock, lzapp, lzapp2, deployer)
+    return [lzapp, lzapp2]
+
+@pytest.fixture(scope="session")
+def omnisetters(project, deployer, lz_mock):
+    lzapp = project.OmniSetter.deploy(lz_mock, sender=deployer)
+    lzapp2 = project.OmniSetter.deploy(lz_mock, sender=deployer)
+    connect_lzapps(lz_mock, lzapp, lzapp2, deployer)
+    return [lzapp, lzapp2]
@@ -1,13 +1,13 @@
 import ape
-from web3 import Web3
-from eth_account.messages import encode_defunct
+import pytest
 from eip712.messages import EIP712Message
 from ape.types.signatures import recover_signer
 
 def test_book_add_order(maker, tokens, book):
     # add order
     tx = book.add_order(tokens[0], 10, tokens[1], 20, sender=maker)
-    assert tx.events == [book.OrderAdded(maker, tokens[0], 10, tokens[1], 20, 0)]
+    assert book.OrderAdded(maker, tokens[0], 10, tokens[1], 20, 0) in tx.events
+    assert len(tx.events) == 1
     assert book.orders(0) == (maker, tokens[0], 10, tokens[1], 20, 0, True)
     assert book.current_nonce() == 1
 
@@ -16,8 +16,6 @@ def test_book_fill_order(maker, taker, tokens, book):
     book.add_order(tokens[0], 10, tokens[1], 20, sender=maker)
 
     # fill order
-    tokens[0].approve(book.address, 10, sender=maker)
-    tokens[1].approve(book.address, 20, sender=taker)
     tx = book.fill_order(0, sender=taker)
 
     assert tokens[0].Transfer(maker, taker, 10) in tx.events
@@ -30,9 +28,6 @@ def test_book_cannot_fill_cancelled_order(maker, taker, tokens, book):
     book.cancel_order(0, sender=maker)
 
     # fill order
-    tokens[0].approve(book.address, 10, sender=maker)
-    tokens[1].approve(book.address, 20, sender=taker)
-
     with ape.reverts("Order is not active"):
         book.fill_order(0, sender=taker)
 
@@ -55,9 +50,6 @@ def test_books(tokens, books, maker, taker):
     maker_start_bal = tokenA.balanceOf(maker)
     taker_start_bal = tokenB.balanceOf(taker)
 
-    tokenA.approve(book_a.address, 10, sender=maker)
-    tokenB.approve(book_b.address, 20, sender=taker)
-
     # fill order
     tx = book_b.fill_order_on_book(0, book_a, sender=taker)
 
@@ -79,7 +71,6 @@ def test_books_cancel(tokens, books, maker, taker, turtle):
     book_a.add_order(tokenA, 10, tokenB, 20, sender=maker)
     book_a.cancel_order(0, sender=maker)
 
-    tokenB.approve(book_b.address, 20, sender=turtle)
     tx = book_b.fill_order_on_book(0, book_a, sender=turtle)
 
     assert tokenB.Transfer(turtle, book_b, 20) in tx.events
@@ -88,8 +79,6 @@ def test_books_cancel(tokens, books, maker, taker, turtle):
     assert book_b.RemoteOrderFillCandidate(book_a.address, 0) in tx.events
     assert book_b.RemoteOrderFillCanceled(book_a.address, 0) in tx.events
 
-    tokenB.approve(book_b.address, 20, sender=turtle)
-
 def test_books_cancel_already_filled(tokens, books, maker, taker, turtle):
 
     tokenA, tokenB = tokens[:2]
@@ -97,11 +86,8 @@ def test_books_cancel_already_filled(tokens, books, maker, taker, turtle):
 
     book_a.add_order(tokenA, 10, tokenB, 20, sender=maker)
 
-    tokenA.approve(book_a.address, 10, sender=maker)
-    tokenB.approve(book_b.address, 20, sender=taker)
     book_b.fill_order_on_book(0, book_a, sender=taker)
 
-    tokenB.approve(book_b.address, 20, sender=turtle)
     tx = book_b.fill_order_on_book(0, book_a, sender=turtle)
 
     assert tokenB.Transfer(turtle, book_b, 20) in tx.events
@@ -117,7 +103,8 @@ def test_books_cancel_maker_canceled_approval(tokens, books, maker, taker, turtl
 
     book_a.add_order(tokenA, 10, tokenB, 20, sender=maker)
 
-    tokenB.approve(book_b.address, 20, sender=taker)
+    # maker revokes the allowance the fixture gave book_a
+    tokenA.approve(book_a.address, 0, sender=maker)
     tx = book_b.fill_order_on_book(0, book_a, sender=taker)
 
     assert book_b.RemoteOrderFillCandidate(book_a.address, 0) in tx.events
@@ -149,44 +136,44 @@ class XOrder(EIP712Message):
     desired_amount: "uint256" # type: ignore
     nonce: "uint256" # type: ignore
 
-def test_order_sigs(maker, tokens, book, taker):
+def order_fields(order_cls, maker, asset, desired, domains=(0, 1)):
+    # fields for a 10 asset -> 20 desired order, in struct order
+    fields = (maker.address, asset.address, 10, desired.address, 20, 0)
+    if order_cls is XOrder:
+        return domains + fields
+    return fields + (True,)
+
+# build an order with its EIP-712 domain already filled in
+def make_order(order_cls, order_struct, verifying_contract, chain_id):
+    order = order_cls(*order_struct) # type: ignore
+    order._chainId_ = chain_id
+    order._verifyingContract_ = verifying_contract
+    return order
+
+# not memoized: almost every test signs a different order, so a cache would hardly ever hit
+def sign_order(signer, order_cls, order_struct, book, chain_id=None):
+    if chain_id is None:
+        chain_id = ape.chain.chain_id
+    message = make_order(order_cls, order_struct, book.address, chain_id).signable_message
+    return message, signer.sign_message(message)
+
+@pytest.mark.parametrize("order_cls,check", [
+    (Order, "check_order_signature"),
+    (XOrder, "check_xorder_signature"),
+])
+def test_sigs(maker, tokens, book, order_cls, check):
     tokenA, tokenB = tokens[:2]
-    order_to_sign = Order(maker.address, tokenA.address, 10, tokenB.address, 20, 0, True) # type: ignore
+    order_struct = order_fields(order_cls, maker, tokenA, tokenB)
     assert book.domain() == 0
-    order_to_sign._chainId_ = 31337
-    order_to_sign._verifyingContract_ = book.address
-    message = order_to_sign.signable_message
-    signature = maker.sign_message(message)
-    order_struct = (maker.address, tokenA.address, 10, tokenB.address, 20, 0, True)
-    assert recover_signer(message, signature) == maker.address
-
-    assert book.check_order_signature(order_struct, signature.encode_vrs(), maker)
-
-def test_xorder_sigs(maker, tokens, book, taker):
-    tokenA, tokenB = tokens[:2]
-    order_to_sign = XOrder(0, 1, maker.address, tokenA.address, 10, tokenB.address, 20, 0) # type: ignore
-    order_to_sign._chainId_ = 31337
-    order_to_sign._verifyingContract_ = book.address
-    print(order_to_sign)
-    message = order_to_sign.signable_message
-    signature = maker.sign_message(message)
-    order_struct = (0, 1, maker.address, tokenA.address, 10, tokenB.address, 20, 0)
+    message, signature = sign_order(maker, order_cls, order_struct, book)
     assert recover_signer(message, signature) == maker.address
 
-    assert book.check_xorder_signature(order_struct, signature.encode_vrs(), maker)
+    assert getattr(book, check)(order_struct, signature.encode_vrs(), maker)
 
 def test_fill_sig_order(maker, taker, book, tokens):
     tokenA, tokenB = tokens[:2]
-    order_to_sign = Order(maker.address, tokenA.address, 10, tokenB.address, 20, 0, True) # type: ignore
-    order_to_sign._chainId_ = 31337
-    order_to_sign._verifyingContract_ = book.address
-    message = order_to_sign.signable_message
-    signature = maker.sign_message(message)
-    order_struct = (maker.address, tokenA.address, 10, tokenB.address, 20, 0, True)
-
-    # token approvals
-    tokenA.approve(book.address, 10, sender=maker)
-    tokenB.approve(book.address, 20, sender=taker)
+    order_struct = order_fields(Order, maker, tokenA, tokenB)
+    _, signature = sign_order(maker, Order, order_struct, book)
 
     tx = book.fill_signed_order(order_struct, signature.encode_vrs(), sender=taker)
 
@@ -202,18 +189,14 @@ def test_fill_sig_order(maker, taker, book, tokens):
 def test_validate_xorder(maker, taker, books, tokens):
     tokenA, tokenB = tokens[:2]
     book_a, book_b = books
-    order_to_sign = XOrder(1, 2, maker.address, tokenA.address, 10, tokenB.address, 20, 0) # type: ignore
-    order_to_sign._chainId_ = 31337
-    order_to_sign._verifyingContract_ = book_b.address
-    message = order_to_sign.signable_message
-    signature = maker.sign_message(message)
-    order_struct = (1, 2, maker.address, tokenA.address, 10, tokenB.address, 20, 0)
+    order_struct = order_fields(XOrder, maker, tokenA, tokenB, domains=(1, 2))
+    _, signature = sign_order(maker, XOrder, order_struct, book_b)
 
     # Check we can validate a valid xorder
     assert book_b.validate_xorder(order_struct, signature.encode_vrs())
 
     # Check that we reject an xorder signed by anyone but the maker
-    imposter_signature = taker.sign_message(message)
+    _, imposter_signature = sign_order(taker, XOrder, order_struct, book_b)
     assert not book_b.validate_xorder(order_struct, imposter_signature.encode_vrs())
 
     # Check that we reject an xorder with a different target domain